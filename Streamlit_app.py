@@ -20,60 +20,170 @@ RANGES = {
     'Nitrates_ppm': {'optimal_low': 0.0, 'optimal_high': 5.0}
 }
 
+# Maximum Possible Score (total weight magnitude), hoisted out of the hot path
+MAX_SCORE = float(sum(abs(w) for w in WEIGHTS.values()))
+
+# Scalar copies of the weights and range bounds for the Numba kernel below:
+# nopython-compiled code cannot index Python dicts, but it folds module-level
+# floats into the machine code as immediates.
+_W_PH = WEIGHTS['pH']
+_W_DO = WEIGHTS['DO_mgL']
+_ABS_W_TEMP = abs(WEIGHTS['Temp_C'])
+_ABS_W_NITR = abs(WEIGHTS['Nitrates_ppm'])
+_PH_LOW = RANGES['pH']['optimal_low']
+_PH_HIGH = RANGES['pH']['optimal_high']
+_DO_LOW = RANGES['DO_mgL']['optimal_low']
+_TEMP_HIGH = RANGES['Temp_C']['optimal_high']
+_NITR_HIGH = RANGES['Nitrates_ppm']['optimal_high']
+
+# The weights table shown on the Model and Awareness page. WEIGHTS is frozen,
+# so the DataFrame is built once at import instead of on every page view.
+WEIGHTS_DF = pd.DataFrame({'Abiotic Factor': list(WEIGHTS),
+                           'Weight/Impact': list(WEIGHTS.values())})
+WEIGHTS_DF['Type'] = np.where(WEIGHTS_DF['Weight/Impact'] > 0,
+                              "Positive (Health Booster)",
+                              "Negative (Stress/Pollution)")
+
+# Interpretation bands for the final score. np.searchsorted picks the band with
+# one binary search instead of walking an if/elif chain on every rerun, and the
+# heading + detail live in one markdown block so each result is a single
+# Streamlit message instead of two.
+_HEALTH_LEVELS = np.array([5.0, 7.5])
+_HEALTH_MSGS = (
+    (st.error,
+     "## Predicted Ecosystem Health: POOR ({score})\n"
+     "### 💀 **CRITICAL DANGER!** These abiotic conditions (likely low DO, high Nitrates, or high Temp) are lethal to most aquatic life. This is a severe pollution or climate stress event."),
+    (st.warning,
+     "## Predicted Ecosystem Health: MODERATE ({score})\n"
+     "### ⚠️ **Stress Detected.** Some abiotic factors are out of the optimal range. Sensitive biotic components (like trout or certain insects) are likely suffering."),
+    (st.success,
+     "## Predicted Ecosystem Health: HIGH ({score})\n"
+     "### 🐠 **Excellent conditions.** Biotic health is maximized. This represents a well-preserved ecosystem."),
+)
+
 # --- 2. Core Health Calculation Function ---
 
-def calculate_health_score(pH, DO_mgL, Temp_C, Nitrates_ppm):
+def _health_score_numpy(pH, DO_mgL, Temp_C, Nitrates_ppm):
     """
     Calculates the Ecosystem Health Score (0-10) based on weighted deviations
     from optimal abiotic conditions.
+
+    The arithmetic is branchless, so each input may be a plain float or a
+    NumPy array (broadcast against the others): a whole sweep or grid of
+    conditions is scored in a single vectorized pass instead of one Python
+    call per sample.
     """
-    
-    # 1. Initialize Score and Maximum Possible Score
-    score = 0
-    max_score = sum(abs(w) for w in WEIGHTS.values()) # Total weight magnitude
-    
-    # 2. Calculate contribution for each factor
-    
-    # pH Contribution (Positive Factor)
-    pH_range = RANGES['pH']
-    if pH >= pH_range['optimal_low'] and pH <= pH_range['optimal_high']:
-        score += WEIGHTS['pH']
-    elif pH > pH_range['optimal_high'] or pH < pH_range['optimal_low']:
-        # Score decreases linearly as pH moves away from optimal center (7.0)
-        deviation = abs(pH - 7.0)
-        score += WEIGHTS['pH'] * max(0.0, 1.0 - deviation / 1.5) # Scale deviation
-        
-    # Dissolved Oxygen (DO) Contribution (Critical Positive Factor)
-    DO_range = RANGES['DO_mgL']
-    if DO_mgL >= DO_range['optimal_low']:
-        score += WEIGHTS['DO_mgL']
-    elif DO_mgL < DO_range['optimal_low']:
-        # Score decreases sharply below critical threshold (e.g., 6.0 mg/L)
-        score += WEIGHTS['DO_mgL'] * (DO_mgL / DO_range['optimal_low']) * 0.5
-        
-    # Temperature (Temp_C) Contribution (Negative Factor)
-    Temp_range = RANGES['Temp_C']
-    if Temp_C <= Temp_range['optimal_high']:
-        score += abs(WEIGHTS['Temp_C'])
-    else:
-        # Score decreases linearly as temperature rises above optimal
-        deviation = Temp_C - Temp_range['optimal_high']
-        score += abs(WEIGHTS['Temp_C']) * max(0.0, 1.0 - deviation / 15.0)
-        
+
+    # pH Contribution (Positive Factor): full weight inside the optimal band,
+    # otherwise decreases linearly as pH moves away from optimal center (7.0)
+    score = np.where(
+        (pH >= _PH_LOW) & (pH <= _PH_HIGH),
+        _W_PH,
+        _W_PH * np.clip(1.0 - np.abs(pH - 7.0) / 1.5, 0.0, 1.0)
+    )
+
+    # Dissolved Oxygen (DO) Contribution (Critical Positive Factor): full
+    # weight above the critical threshold, decreases sharply below it
+    score = score + np.where(
+        DO_mgL >= _DO_LOW,
+        _W_DO,
+        _W_DO * (DO_mgL / _DO_LOW) * 0.5
+    )
+
+    # Temperature (Temp_C) Contribution (Negative Factor): the clip expresses
+    # both branches — full weight at or below the optimal maximum, linear
+    # fall-off above it
+    score = score + _ABS_W_TEMP * np.clip(
+        1.0 - (Temp_C - _TEMP_HIGH) / 15.0, 0.0, 1.0)
+
     # Nitrates (Nitrates_ppm) Contribution (Critical Negative Factor/Pollution)
-    Nitrate_range = RANGES['Nitrates_ppm']
-    if Nitrates_ppm <= Nitrate_range['optimal_high']:
-        score += abs(WEIGHTS['Nitrates_ppm'])
+    score = score + _ABS_W_NITR * np.clip(
+        1.0 - (Nitrates_ppm - _NITR_HIGH) / 20.0, 0.0, 1.0)
+
+    # Normalize and Scale (0-10) relative to the maximum possible score
+    return np.clip((score / MAX_SCORE) * 10.0, 0.0, 10.0)
+
+
+def _health_score_kernel(pH, DO_mgL, Temp_C, Nitrates_ppm):
+    """Scalar core of the health score; same model as _health_score_numpy."""
+    if _PH_LOW <= pH <= _PH_HIGH:
+        score = _W_PH
     else:
-        # Score decreases sharply as nitrates rise above critical threshold
-        deviation = Nitrates_ppm - Nitrate_range['optimal_high']
-        score += abs(WEIGHTS['Nitrates_ppm']) * max(0.0, 1.0 - deviation / 20.0)
-        
-    # 3. Normalize and Scale (0-10)
-    # Total score is calculated based on how many "points" were achieved relative to the max possible.
-    final_score = np.clip((score / max_score) * 10, 0.0, 10.0)
-    
-    return final_score
+        score = _W_PH * max(0.0, 1.0 - abs(pH - 7.0) / 1.5)
+
+    if DO_mgL >= _DO_LOW:
+        score += _W_DO
+    else:
+        score += _W_DO * (DO_mgL / _DO_LOW) * 0.5
+
+    if Temp_C <= _TEMP_HIGH:
+        score += _ABS_W_TEMP
+    else:
+        score += _ABS_W_TEMP * max(0.0, 1.0 - (Temp_C - _TEMP_HIGH) / 15.0)
+
+    if Nitrates_ppm <= _NITR_HIGH:
+        score += _ABS_W_NITR
+    else:
+        score += _ABS_W_NITR * max(0.0, 1.0 - (Nitrates_ppm - _NITR_HIGH) / 20.0)
+
+    return min(10.0, max(0.0, (score / MAX_SCORE) * 10.0))
+
+
+try:
+    from numba import vectorize, float64
+
+    _HEALTH_SIG = [float64(float64, float64, float64, float64)]
+    # The cpu target serves the single-score slider path (compiled once, then
+    # cached on disk); the parallel variant thread-scales over large batches.
+    calculate_health_score = vectorize(
+        _HEALTH_SIG, cache=True)(_health_score_kernel)
+    calculate_health_score_batch = vectorize(
+        _HEALTH_SIG, target='parallel')(_health_score_kernel)
+except ImportError:
+    # Numba is optional: the branchless NumPy form already handles both the
+    # scalar and the batched case, just without the compiled fast path.
+    calculate_health_score = _health_score_numpy
+    calculate_health_score_batch = _health_score_numpy
+
+
+@st.cache_data(max_entries=1024)
+def cached_score(pH, DO_mgL, Temp_C, Nitrates_ppm):
+    """Memoized scalar score: revisiting a prior slider state is a cache hit."""
+    return float(calculate_health_score(pH, DO_mgL, Temp_C, Nitrates_ppm))
+
+
+# Sweep axes for the sensitivity heatmap, matching the slider ranges and built
+# once at import. meshgrid gives contiguous float64 grids the batch ufunc can
+# chew through in one pass.
+_PH_AXIS = np.linspace(5.0, 9.0, 100)
+_DO_AXIS = np.linspace(2.0, 15.0, 100)
+_PH_GRID, _DO_GRID = np.meshgrid(_PH_AXIS, _DO_AXIS, indexing='ij')
+
+
+def sweep_score(Temp_C=20.0, Nitrates_ppm=2.0):
+    """Scores the full pH x DO grid at fixed temperature and nitrate levels."""
+    return calculate_health_score_batch(_PH_GRID, _DO_GRID, Temp_C, Nitrates_ppm)
+
+
+@st.cache_data(max_entries=64)
+def _heatmap_fig(Temp_C, Nitrates_ppm):
+    """Builds the pH x DO heatmap figure for one Temperature/Nitrates setting."""
+    # Imported lazily: plotly is only needed for the heatmap expander. The
+    # low-level graph_objects path skips plotly.express' input introspection —
+    # same rendered chart, far fewer Python objects per build.
+    import plotly.graph_objects as go
+
+    scores = sweep_score(Temp_C, Nitrates_ppm)
+    fig = go.Figure(go.Heatmap(
+        z=scores,
+        x=_DO_AXIS, y=_PH_AXIS,
+        zmin=0.0, zmax=10.0,
+        colorscale='RdYlGn',
+        colorbar={'title': "Health Score"}
+    ))
+    fig.update_layout(xaxis_title="Dissolved Oxygen (mg/L)",
+                      yaxis_title="Water pH")
+    return fig
 
 # --- 3. Streamlit Application Layout ---
 
@@ -89,86 +199,102 @@ def main():
     st.markdown("---")
     
     st.sidebar.title("App Navigation")
-    selection = st.sidebar.radio("Go to:", ["Ecosystem Calculator", "Model and Awareness"])
+    selection = st.sidebar.radio("Go to:", list(PAGES), key="nav")
 
-    if selection == "Ecosystem Calculator":
-        run_calculator()
-    elif selection == "Model and Awareness":
-        display_awareness_and_model()
+    PAGES[selection]()
+
+
+# Slider definitions for the calculator page: (label, min, max, default, step, key).
+# Explicit keys give each widget a stable session-state bucket across reruns
+# (and keep the cached_score cache keys reliable).
+SLIDER_CFG_CALC = (
+    ("Water pH (Optimal 6.5-7.5)", 5.0, 9.0, 7.0, 0.1, "ph_calc"),
+    ("Dissolved Oxygen (mg/L) (Critical > 6.0)", 2.0, 15.0, 7.5, 0.1, "do_calc"),
+    ("Water Temperature (°C) (Stress > 20)", 5.0, 35.0, 20.0, 0.1, "temp_calc"),
+    ("Nitrates (ppm) (Pollution > 5.0)", 0.0, 30.0, 2.0, 0.1, "nitrates_calc"),
+)
+
+
+def _four_sliders(cfg):
+    """Renders one slider per column from (label, min, max, default, step, key) rows."""
+    cols = st.columns(len(cfg))
+    return tuple(
+        col.slider(label, min_value=lo, max_value=hi, value=default, step=step, key=key)
+        for col, (label, lo, hi, default, step, key) in zip(cols, cfg)
+    )
 
 
 def run_calculator():
     """Interactive section where users set abiotic values to calculate health."""
-    
+
     st.header("Interactive Abiotic Condition Setter")
     st.info("Adjust the abiotic parameters below to see the immediate effect on the calculated Ecosystem Health Score. This demonstrates the fragility of the biotic environment.")
-    
+
     # --- Input Sliders ---
-    col_sliders = st.columns(4)
-    
-    with col_sliders[0]:
-        user_pH = st.slider("Water pH (Optimal 6.5-7.5)", min_value=5.0, max_value=9.0, value=7.0, step=0.1)
-    
-    with col_sliders[1]:
-        user_DO = st.slider("Dissolved Oxygen (mg/L) (Critical > 6.0)", min_value=2.0, max_value=15.0, value=7.5, step=0.1)
-        
-    with col_sliders[2]:
-        user_Temp = st.slider("Water Temperature (°C) (Stress > 20)", min_value=5.0, max_value=35.0, value=20.0, step=0.1)
-        
-    with col_sliders[3]:
-        user_Nitrates = st.slider("Nitrates (ppm) (Pollution > 5.0)", min_value=0.0, max_value=30.0, value=2.0, step=0.1)
+    user_pH, user_DO, user_Temp, user_Nitrates = _four_sliders(SLIDER_CFG_CALC)
     
     # --- Calculation and Output ---
     
-    # Call the core calculation function
-    predicted_health = calculate_health_score(user_pH, user_DO, user_Temp, user_Nitrates)
+    # Call the core calculation function (memoized per slider state)
+    predicted_health = cached_score(user_pH, user_DO, user_Temp, user_Nitrates)
     
     st.markdown("---")
     
     health_score_display = f"{predicted_health:.2f} / 10"
     
     # --- Output & Awareness Message ---
-    
-    if predicted_health > 7.5:
-        st.success(f"## Predicted Ecosystem Health: HIGH ({health_score_display})")
-        st.markdown("### 🐠 **Excellent conditions.** Biotic health is maximized. This represents a well-preserved ecosystem.")
-    elif predicted_health > 5.0:
-        st.warning(f"## Predicted Ecosystem Health: MODERATE ({health_score_display})")
-        st.markdown("### ⚠️ **Stress Detected.** Some abiotic factors are out of the optimal range. Sensitive biotic components (like trout or certain insects) are likely suffering.")
-    else:
-        st.error(f"## Predicted Ecosystem Health: POOR ({health_score_display})")
-        st.markdown("### 💀 **CRITICAL DANGER!** These abiotic conditions (likely low DO, high Nitrates, or high Temp) are lethal to most aquatic life. This is a severe pollution or climate stress event.")
+
+    box, message = _HEALTH_MSGS[int(np.searchsorted(_HEALTH_LEVELS, predicted_health))]
+    box(message.format(score=health_score_display))
+
+    # --- Sensitivity Heatmap ---
+
+    with st.expander("🗺️ Sensitivity Heatmap: pH × Dissolved Oxygen"):
+        st.markdown("Health score over the **entire pH × DO plane** at your current Temperature and Nitrates settings — see how quickly the healthy region shrinks as the other factors degrade.")
+        st.plotly_chart(_heatmap_fig(user_Temp, user_Nitrates), use_container_width=True)
     
     
 
-def display_awareness_and_model():
-    """Displays model explanation and awareness info."""
-    
-    st.header("Model Explanation: The Power of Weights")
-    st.markdown("""
+# Static copy for the Model and Awareness page, hoisted to module scope so a
+# page view just replays pre-built strings instead of re-creating them.
+_MODEL_INTRO_MD = """
     This calculator uses a **Weighted Score Model** based on established environmental science to show the impact of abiotic changes. Each factor is given a weight based on its biological importance:
-    """)
-    
-    weights_df = pd.DataFrame(WEIGHTS.items(), columns=['Abiotic Factor', 'Weight/Impact'])
-    weights_df['Type'] = weights_df['Weight/Impact'].apply(lambda x: "Positive (Health Booster)" if x > 0 else "Negative (Stress/Pollution)")
-    
-    st.dataframe(weights_df, use_container_width=True, hide_index=True)
-    
-    st.markdown("""
+    """
+
+_MODEL_NOTES_MD = """
     * **$\text{DO}$ and $\text{Nitrates}$** have the highest weights because Dissolved Oxygen is vital for respiration, and excess Nitrates indicate critical pollution (eutrophication).
     * The final score is a reflection of how far the input values deviate from the established **Optimal Ranges**.
-    """)
-    
-    st.markdown("---")
-    
-    st.header("🌍 Environmental Awareness: The Call to Action")
-    st.markdown("""
+    """
+
+_AWARENESS_MD = """
     **Awareness is Action.** This simulation highlights how small abiotic changes can have massive impacts on biotic components. To maintain a **HIGH** health score in nature:
-    
+
     * **Manage Runoff:** Reduce the use of fertilizers and limit soil erosion to control Nitrate pollution.
     * **Protect Riparian Zones:** Planting trees and vegetation near water bodies helps regulate temperature and filter pollutants, directly improving **Temp\_C** and **Nitrates\_ppm**.
     * **Educate:** Share the critical relationship between $\text{DO}$ and aquatic life to gain support for conservation efforts.
-    """)
+    """
+
+
+def display_awareness_and_model():
+    """Displays model explanation and awareness info."""
+
+    st.header("Model Explanation: The Power of Weights")
+    st.markdown(_MODEL_INTRO_MD)
+
+    st.dataframe(WEIGHTS_DF, use_container_width=True, hide_index=True)
+
+    st.markdown(_MODEL_NOTES_MD)
+
+    st.markdown("---")
+
+    st.header("🌍 Environmental Awareness: The Call to Action")
+    st.markdown(_AWARENESS_MD)
+
+# Sidebar navigation: one dict lookup dispatches the selected page.
+PAGES = {
+    "Ecosystem Calculator": run_calculator,
+    "Model and Awareness": display_awareness_and_model,
+}
 
 # --- Run the App ---
 if __name__ == "__main__":